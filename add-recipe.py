@@ -8,14 +8,54 @@ Usage: python add-recipe.py
 import os
 import re
 import shutil
-from datetime import datetime
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import strftime
+from types import MappingProxyType
+
+class _SlugTable(dict):
+    """str.translate table that drops anything outside [\\w\\s-], filled in lazily per code point"""
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        keep = char.isalnum() or char.isspace() or char in '_-'
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+_SLUG_TABLE = _SlugTable()
+_SLUG_DASH = re.compile(r'[-\s]+')
+
+_GRID_OPEN = b'<div class="recipe-card-grid">'
+
+_PRINT_LOCK = threading.Lock()
+
+# insert_card_to_file results
+ADDED = "added"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+_CATEGORY_MAP = MappingProxyType({
+    "1": ("main-dish", "Main Dish"),
+    "2": ("side-dish", "Side Dish"),
+    "3": ("rice", "Rice")
+})
+
+_SECTION_ID_MAP = MappingProxyType({
+    "main-dish": "main-dish-recipes",
+    "side-dish": "side-dish-recipes",
+    "rice": "rice-recipes"
+})
 
 def slugify(text):
     """Convert text to URL-friendly slug"""
-    text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text)
-    return text.strip('-')
+    return _SLUG_DASH.sub('-', text.lower().translate(_SLUG_TABLE)).strip('-')
+
+def log(message):
+    """Print a line without interleaving with other worker threads"""
+    with _PRINT_LOCK:
+        print(message)
 
 def get_input(prompt, default=None):
     """Get user input with optional default"""
@@ -35,52 +75,64 @@ def get_multiselect(prompt, options):
     if not selections:
         return []
 
-    selected_indices = [int(x.strip()) - 1 for x in selections.split(',') if x.strip().isdigit()]
-    return [options[i] for i in selected_indices if 0 <= i < len(options)]
-
-def backup_file(filepath):
+    selected = []
+    for token in selections.split(','):
+        try:
+            # int() ignores surrounding whitespace, so no separate strip/isdigit pass
+            index = int(token) - 1
+        except ValueError:
+            continue
+        if 0 <= index < len(options):
+            selected.append(options[index])
+    return selected
+
+def backup_file(filepath, timestamp=None):
     """Create backup of a file"""
     if not os.path.exists(filepath):
         return None
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if timestamp is None:
+        timestamp = strftime("%Y%m%d_%H%M%S")
     backup_path = f"{filepath}.backup_{timestamp}"
-    shutil.copy2(filepath, backup_path)
+    # Hardlink instead of copying: insert_card_to_file swaps in a new file with
+    # os.replace, so the linked backup keeps the original contents
+    try:
+        os.link(os.path.realpath(filepath), backup_path)
+    except OSError:
+        shutil.copy2(filepath, backup_path)
     return backup_path
 
-def create_recipe_page(recipe_info):
-    """Generate recipe detail page HTML"""
-    template = f"""<!DOCTYPE html>
+_RECIPE_PAGE_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
   <head>
     <meta charset="UTF-8" />
     <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-    <title>{recipe_info['name']} | Joko's Jang-Namul-Bap</title>
+    <title>{name} | Joko's Jang-Namul-Bap</title>
     <link rel="stylesheet" href="../../assets/css/style.css" />
     <script src="../../assets/js/includes.js" defer></script>
   </head>
   <body data-root-path="../..">
     <div data-include="../../partials/header.html" data-root-path="../.."></div>
     <main id="main-content">
-      <article class="recipe-detail" aria-labelledby="{recipe_info['slug']}-heading">
+      <article class="recipe-detail" aria-labelledby="{slug}-heading">
         <div class="recipe-detail-grid">
           <header class="recipe-overview">
-            <span class="category-tag">{recipe_info['category_display']}</span>
-            <h1 class="section-title" id="{recipe_info['slug']}-heading">{recipe_info['name']}</h1>
+            <span class="category-tag">{category_display}</span>
+            <h1 class="section-title" id="{slug}-heading">{name}</h1>
             <img
-              src="../../assets/img/recipes/{recipe_info['image']}"
-              alt="{recipe_info['name']}"
+              src="../../assets/img/recipes/{image}"
+              alt="{name}"
               class="recipe-hero-image"
             />
             <div class="recipe-metadata">
-              <span>⏱ {recipe_info['time']}</span>
-              <span>🥄 Serves {recipe_info['servings']}</span>
+              <span>⏱ {time}</span>
+              <span>🥄 Serves {servings}</span>
             </div>
-            <p>{recipe_info['description']}</p>
+            <p>{description}</p>
           </header>
-          <aside class="recipe-visual" aria-label="{recipe_info['name']} tips">
+          <aside class="recipe-visual" aria-label="{name} tips">
             <span class="recipe-visual__label">Cooking Tips</span>
-            <p>Tips for making delicious {recipe_info['name']}.</p>
+            <p>Tips for making delicious {name}.</p>
             <ul>
               <li>Use fresh ingredients for the best flavor.</li>
               <li>Adjust seasoning to your taste preference.</li>
@@ -89,23 +141,23 @@ def create_recipe_page(recipe_info):
           </aside>
         </div>
 
-        <section class="recipe-content-grid section" aria-labelledby="{recipe_info['slug']}-ingredients">
+        <section class="recipe-content-grid section" aria-labelledby="{slug}-ingredients">
           <section class="recipe-section">
-            <h2 id="{recipe_info['slug']}-ingredients">Ingredients</h2>
+            <h2 id="{slug}-ingredients">Ingredients</h2>
             <ul>
               <li>Add your ingredients here</li>
             </ul>
           </section>
-          <aside class="aside-panel" aria-labelledby="{recipe_info['slug']}-substitution">
-            <h2 id="{recipe_info['slug']}-substitution">Substitution Tips</h2>
+          <aside class="aside-panel" aria-labelledby="{slug}-substitution">
+            <h2 id="{slug}-substitution">Substitution Tips</h2>
             <ul>
               <li>Check the Vegan & Halal Guide for ingredient substitutions.</li>
             </ul>
           </aside>
         </section>
 
-        <section class="recipe-steps section" aria-labelledby="{recipe_info['slug']}-steps">
-          <h2 id="{recipe_info['slug']}-steps">Instructions</h2>
+        <section class="recipe-steps section" aria-labelledby="{slug}-steps">
+          <h2 id="{slug}-steps">Instructions</h2>
           <ol>
             <li>Add your cooking steps here.</li>
           </ol>
@@ -116,12 +168,41 @@ def create_recipe_page(recipe_info):
   </body>
 </html>
 """
-    return template
+
+def replace_file_contents(filepath, data):
+    """Atomically replace a file's contents, keeping its mode, ownership and symlinks"""
+    # Write next to the real file (not the symlink) so os.replace stays on one filesystem
+    target = os.path.realpath(filepath)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        shutil.copymode(target, tmp_path)
+        st = os.stat(target)
+        try:
+            os.chown(tmp_path, st.st_uid, st.st_gid)
+        except (AttributeError, PermissionError):
+            pass
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def create_recipe_page(recipe_info):
+    """Generate recipe detail page HTML"""
+    return _RECIPE_PAGE_TEMPLATE.format_map(recipe_info)
+
+def get_card_link(recipe_info, for_index=False):
+    """Get the recipe page link used by a recipe card"""
+    if for_index:
+        return f"recipes/{recipe_info['category']}/{recipe_info['slug']}.html"
+    return f"{recipe_info['category']}/{recipe_info['slug']}.html"
 
 def create_recipe_card(recipe_info, for_index=False):
     """Generate recipe card HTML"""
     img_path = f"assets/img/recipes/{recipe_info['image']}" if for_index else f"../assets/img/recipes/{recipe_info['image']}"
-    link_path = f"recipes/{recipe_info['category']}/{recipe_info['slug']}.html" if for_index else f"{recipe_info['category']}/{recipe_info['slug']}.html"
+    link_path = get_card_link(recipe_info, for_index)
 
     card = f"""          <article class="card recipe-card"
                    data-category="{recipe_info['category']}"
@@ -141,66 +222,106 @@ def create_recipe_card(recipe_info, for_index=False):
 """
     return card
 
-def insert_card_to_file(filepath, card_html, section_id):
-    """Insert recipe card into HTML file"""
-    try:
-        # Backup first
-        backup_path = backup_file(filepath)
-        if backup_path:
-            print(f"  📦 Backup created: {backup_path}")
+def find_section(content, section_id):
+    """Return the offset of the <section> tag with the given id, or -1"""
+    marker = f'id="{section_id}"'.encode('utf-8')
+    pos = content.find(marker)
+    while pos != -1:
+        tag_start = content.rfind(b'<', 0, pos)
+        if content.startswith(b'<section', tag_start) and content.find(b'>', tag_start, pos) == -1:
+            return tag_start
+        pos = content.find(marker, pos + len(marker))
+    return -1
+
+def find_closing_div(content, start):
+    """Return the offset of the </div> closing the div opened just before start, or -1"""
+    depth = 1
+    pos = start
+    close_pos = -1
+    while depth:
+        # Only search for the next </div> once we've moved past the previous one,
+        # otherwise every nested <div> would rescan the same stretch (quadratic)
+        if close_pos < pos:
+            close_pos = content.find(b'</div>', pos)
+            if close_pos == -1:
+                return -1
+        open_pos = content.find(b'<div', pos, close_pos)
+        if open_pos != -1:
+            depth += 1
+            pos = open_pos + len(b'<div')
+        else:
+            depth -= 1
+            pos = close_pos + len(b'</div>')
+    return close_pos
+
+def insert_card_to_file(filepath, card_html, section_id, link_path=None, timestamp=None):
+    """Insert recipe card into HTML file
 
+    Returns ADDED, SKIPPED (a card already links to link_path) or FAILED.
+    """
+    try:
         # Read file
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = bytearray(Path(filepath).read_bytes())
+
+        # Nothing to do if the card is already there (e.g. re-running for the same recipe)
+        if link_path and f'href="{link_path}"'.encode('utf-8') in content:
+            return SKIPPED
 
         # Find insertion point
         # Look for the recipe-card-grid div within the section
-        section_pattern = rf'<section[^>]*id="{section_id}"[^>]*>(.*?)</section>'
-        section_match = re.search(section_pattern, content, re.DOTALL)
+        section_start = find_section(content, section_id)
 
-        if not section_match:
-            print(f"  ❌ Could not find section #{section_id}")
-            return False
+        if section_start == -1:
+            log(f"  ❌ Could not find section #{section_id}")
+            return FAILED
 
-        section_content = section_match.group(1)
+        section_end = content.find(b'</section>', section_start)
+        if section_end == -1:
+            section_end = len(content)
+        grid_start = content.find(_GRID_OPEN, section_start, section_end)
 
-        # Find the last </article> before </div> in recipe-card-grid
-        grid_pattern = r'<div class="recipe-card-grid">(.*?)</div>'
-        grid_match = re.search(grid_pattern, section_content, re.DOTALL)
+        if grid_start == -1:
+            log(f"  ❌ Could not find recipe-card-grid in section #{section_id}")
+            return FAILED
 
-        if not grid_match:
-            print(f"  ❌ Could not find recipe-card-grid in section #{section_id}")
-            return False
+        grid_open_end = grid_start + len(_GRID_OPEN)
+        grid_end = find_closing_div(content, grid_open_end)
 
-        grid_content = grid_match.group(1)
+        if grid_end == -1:
+            log(f"  ❌ Unclosed recipe-card-grid in section #{section_id}")
+            return FAILED
 
         # Find the last </article> in the grid
-        last_article_pos = grid_content.rfind('</article>')
+        last_article_pos = content.rfind(b'</article>', grid_open_end, grid_end)
 
         if last_article_pos == -1:
             # No articles yet, insert at the beginning
-            insertion_point = content.find('<div class="recipe-card-grid">', section_match.start()) + len('<div class="recipe-card-grid">')
-            new_content = content[:insertion_point] + '\n' + card_html + content[insertion_point:]
+            insertion_point = grid_open_end
         else:
             # Insert after the last </article>
-            absolute_pos = content.find(grid_content, section_match.start()) + last_article_pos + len('</article>')
-            new_content = content[:absolute_pos] + '\n' + card_html + content[absolute_pos:]
+            insertion_point = last_article_pos + len(b'</article>')
+
+        content[insertion_point:insertion_point] = b'\n' + card_html.encode('utf-8')
 
-        # Write back
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        # Backup only once we know the file is actually going to change
+        backup_path = backup_file(filepath, timestamp=timestamp)
+        if backup_path:
+            log(f"  📦 Backup created: {backup_path}")
+
+        # Write to a temp file and swap it in, so a failed write never leaves a truncated file
+        replace_file_contents(filepath, content)
 
-        return True
+        return ADDED
 
     except Exception as e:
-        print(f"  ❌ Error: {e}")
-        # Restore from backup if exists
-        if backup_path and os.path.exists(backup_path):
-            shutil.copy2(backup_path, filepath)
-            print(f"  🔄 Restored from backup")
-        return False
+        log(f"  ❌ Error: {e}")
+        # The original file is untouched; replace_file_contents cleans up its temp file
+        return FAILED
 
 def main():
+    # One timestamp per run so every backup from this run shares the same suffix
+    run_timestamp = strftime("%Y%m%d_%H%M%S")
+
     print("=" * 60)
     print("  🍜 Quick Recipe Adder for Joko's Jang-Namul-Bap")
     print("=" * 60)
@@ -221,12 +342,7 @@ def main():
     print("  3. Rice")
     category_choice = get_input("Enter number", "1")
 
-    category_map = {
-        "1": ("main-dish", "Main Dish"),
-        "2": ("side-dish", "Side Dish"),
-        "3": ("rice", "Rice")
-    }
-    category, category_display = category_map.get(category_choice, ("main-dish", "Main Dish"))
+    category, category_display = _CATEGORY_MAP.get(category_choice, ("main-dish", "Main Dish"))
 
     # Description
     description = get_input("Short description", f"Delicious Korean {name}")
@@ -296,35 +412,41 @@ def main():
     recipe_path = f"recipes/{category}/{slug}.html"
 
     os.makedirs(os.path.dirname(recipe_path), exist_ok=True)
-    with open(recipe_path, 'w', encoding='utf-8') as f:
-        f.write(recipe_page)
+    Path(recipe_path).write_bytes(recipe_page.encode('utf-8'))
     print(f"\n✅ Created recipe page: {recipe_path}")
 
     # Generate recipe cards
     card_for_index = create_recipe_card(recipe_info, for_index=True)
     card_for_recipes = create_recipe_card(recipe_info, for_index=False)
 
-    # Auto-insert into index.html
-    print("\n📝 Adding to index.html...")
-    if insert_card_to_file("index.html", card_for_index, "featured-recipes-section"):
+    # Auto-insert into index.html and recipes/index.html
+    # The two files are independent, so update them concurrently
+    section_id = _SECTION_ID_MAP[category]
+
+    print("\n📝 Adding to index.html and recipes/index.html...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        index_future = executor.submit(
+            insert_card_to_file, "index.html", card_for_index, "featured-recipes-section",
+            link_path=get_card_link(recipe_info, for_index=True), timestamp=run_timestamp)
+        recipes_future = executor.submit(
+            insert_card_to_file, "recipes/index.html", card_for_recipes, section_id,
+            link_path=get_card_link(recipe_info), timestamp=run_timestamp)
+        index_status, recipes_status = index_future.result(), recipes_future.result()
+
+    if index_status == ADDED:
         print("  ✅ Successfully added to index.html")
+    elif index_status == SKIPPED:
+        print("  ⏭️  Already listed in index.html, left unchanged")
     else:
         print("  ❌ Failed to add to index.html (manual insertion needed)")
         print("\n  Copy this code to index.html (#featured-recipes-section):")
         print("  " + "-" * 56)
         print(card_for_index)
 
-    # Auto-insert into recipes/index.html
-    section_id_map = {
-        "main-dish": "main-dish-recipes",
-        "side-dish": "side-dish-recipes",
-        "rice": "rice-recipes"
-    }
-    section_id = section_id_map[category]
-
-    print("\n📝 Adding to recipes/index.html...")
-    if insert_card_to_file("recipes/index.html", card_for_recipes, section_id):
+    if recipes_status == ADDED:
         print(f"  ✅ Successfully added to recipes/index.html (#{section_id})")
+    elif recipes_status == SKIPPED:
+        print(f"  ⏭️  Already listed in recipes/index.html (#{section_id}), left unchanged")
     else:
         print(f"  ❌ Failed to add to recipes/index.html (manual insertion needed)")
         print(f"\n  Copy this code to recipes/index.html (#{section_id}):")
@@ -345,8 +467,9 @@ def main():
     print(f"   - Check: http://localhost:8000/recipes/{category}/{slug}.html")
 
     print("\n✨ Done! Your recipe has been added to the site.")
-    print("\n💡 Tip: Backup files are saved with .backup_TIMESTAMP extension")
-    print("   You can safely delete them after confirming everything works.")
+    if ADDED in (index_status, recipes_status):
+        print("\n💡 Tip: Backup files are saved with .backup_TIMESTAMP extension")
+        print("   You can safely delete them after confirming everything works.")
 
 if __name__ == "__main__":
     try: